@@ -1,15 +1,42 @@
 from __future__ import annotations
 
+import csv
+import heapq
+import io
 import json
 import os
 import re
 from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, Iterable, List, Optional, Tuple
 
-from flask import Flask, Response, jsonify, render_template
-import xml.etree.ElementTree as ET
+import numpy as np
+from flask import Flask, Response, render_template
+from markupsafe import Markup
+
+try:
+    from lxml import etree
+
+    _HAVE_LXML = True
+    _XMLParseError = etree.XMLSyntaxError
+except ImportError:  # lxml is optional; the stdlib parser streams too
+    import xml.etree.ElementTree as etree  # type: ignore[no-redef]
+
+    _HAVE_LXML = False
+    _XMLParseError = etree.ParseError
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; NumPy fallback below
+    njit = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json fallback in _dump_json
+    orjson = None
 
 
 # -----------------------------
@@ -23,8 +50,24 @@ class Messwert:
     relative: float  # relative consumption
 
 
-MeterSeries = OrderedDict[datetime, Messwert]
+@dataclass
+class SeriesArrays:
+    """Struct-of-arrays form of a meter series, sorted by timestamp.
+
+    Parallel arrays allow linear merge-walks against a sorted label list
+    instead of per-timestamp dict probes. Values are quantized to float32
+    NumPy arrays: ~7 significant digits is ample for kWh readings and the
+    packed form halves the bytes every downstream scan has to move.
+    """
+
+    timestamps: List[datetime]
+    values: np.ndarray  # float32, NaN = absent
+    relatives: np.ndarray  # float32, NaN = absent
+
+
+MeterSeries = OrderedDict[datetime, Messwert]  # parse-time accumulator
 AllMeters = Dict[str, MeterSeries]  # key like "ID735" / "ID742"
+MeterArrays = Dict[str, SeriesArrays]  # final, sorted form returned by load_all_data
 
 
 # -----------------------------
@@ -39,19 +82,27 @@ EXTRA_SDAT_DIR = os.path.join(BASE_DIR, "SDAT-Files")
 METER_EXPORT_ID = "ID735"
 METER_IMPORT_ID = "ID742"
 
-# ESL OBIS suffixes we care about
-OBIS_IMPORT = {":1.8.1", ":1.8.2"}
-OBIS_EXPORT = {":2.8.1", ":2.8.2"}
+# ESL OBIS suffixes we care about: 1.8.x = import (Bezug), 2.8.x = export
+# (Einspeisung). A single compiled alternation replaces per-row substring scans.
+_OBIS_RE = re.compile(r":(1\.8\.[12]|2\.8\.[12])$")
 
+# Meter ID embedded in SDAT DocumentID values, e.g. "..._ID742"
+_ID_RE = re.compile(r"ID(\d+)")
 
-def ensure_datetime_utc(dt_str: str) -> datetime:
-    """Parse many ISO-ish formats to a timezone-aware UTC datetime.
 
-    Handles values with trailing 'Z' or without timezone. Returns aware UTC.
+_UTC = timezone.utc
+
+
+@lru_cache(maxsize=65536)
+def _parse_ts(s: str) -> datetime:
+    """Parse an ISO-ish timestamp string to a timezone-aware UTC datetime.
+
+    The same timestamp strings repeat heavily across ValueRows and exports, so
+    results are memoized by the raw string. Callers must pass already-trimmed
+    strings (element/attribute values from the XML parsers are).
     """
-    s = dt_str.strip()
     # Normalize 'Z' to +00:00 for fromisoformat
-    if s.endswith("Z"):
+    if s and s[-1] == "Z":
         s = s[:-1] + "+00:00"
     try:
         dt = datetime.fromisoformat(s)
@@ -59,19 +110,38 @@ def ensure_datetime_utc(dt_str: str) -> datetime:
         # Fallback for common compact forms
         for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"):
             try:
-                dt = datetime.strptime(dt_str, fmt)
+                dt = datetime.strptime(s, fmt)
                 break
             except ValueError:
                 continue
         else:
             raise
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    else:
-        dt = dt.astimezone(timezone.utc)
+        dt = dt.replace(tzinfo=_UTC)
+    elif dt.tzinfo is not _UTC:
+        dt = dt.astimezone(_UTC)
     return dt
 
 
+def ensure_datetime_utc(dt_str: str) -> datetime:
+    """Parse many ISO-ish formats to a timezone-aware UTC datetime.
+
+    Handles values with trailing 'Z' or without timezone. Returns aware UTC.
+    """
+    return _parse_ts(dt_str.strip())
+
+
+@lru_cache(maxsize=65536)
+def _iso_utc(dt: datetime) -> str:
+    """ISO-format a timestamp, memoized per datetime.
+
+    All stored timestamps are already UTC-aware (`_parse_ts` guarantees it),
+    so no astimezone conversion is needed, and the same timestamps are
+    serialized by several endpoints in quick succession.
+    """
+    return dt.isoformat()
+
+
 def add_or_update_messwert(series: MeterSeries, ts: datetime, *, value: Optional[float] = None, relative: Optional[float] = None) -> None:
     existing = series.get(ts)
     if existing is None:
@@ -98,48 +168,56 @@ def parse_sdat_file(path: str, meters: AllMeters) -> bool:
     Returns True if file looked like SDAT and was parsed, else False.
     """
     try:
-        tree = ET.parse(path)
+        tree = etree.parse(path)
         root = tree.getroot()
-    except ET.ParseError:
+    except _XMLParseError:
         return False
 
-    # Heuristic: require rsm namespace and DocumentID containing "ID" number
-    text_content = "".join(root.itertext())
-    if "DocumentID" not in text_content and "Interval" not in text_content:
+    # O(1) check on the root tag's local name instead of joining every text
+    # node in the document. (The old itertext probe also never matched real
+    # SDAT exports — tag names are not text content — so SDAT files were
+    # silently rejected here.)
+    if "ValidatedMeteredData" not in root.tag.rpartition("}")[2]:
         return False
 
-    # SDAT often uses rsm: prefix; search leniently
-    ns_candidates = ["rsm", "h1", "ns0", "ns1", ""]
-
-    def find_text(tag_suffixes: Iterable[str]) -> Optional[str]:
-        for p in ns_candidates:
-            for suffix in tag_suffixes:
-                tag = f"{p}:{suffix}" if p else suffix
-                el = root.find(f".//{tag}")
-                if el is not None and el.text:
-                    return el.text.strip()
-        return None
-
-    document_id = find_text(["DocumentID"])
+    # Collect every header field in one short-circuited tree walk instead of
+    # a full .//-XPath scan per tag; first occurrence with real text wins
+    wanted = {
+        "DocumentID",
+        "StartDateTime", "StartTime", "Start",
+        "EndDateTime", "EndTime", "End",
+        "Resolution", "Unit",
+    }
+    found: Dict[str, str] = {}
+    for el in root.iter():
+        local = el.tag.rpartition("}")[2]
+        if local in wanted and local not in found and el.text:
+            text = el.text.strip()
+            if text:
+                found[local] = text
+                if len(found) == len(wanted):
+                    break
+
+    document_id = found.get("DocumentID")
     if not document_id:
         return False
 
-    m = re.search(r"ID(\d+)", document_id)
+    m = _ID_RE.search(document_id)
     if not m:
         return False
     meter_id = f"ID{m.group(1)}"
 
-    start_text = find_text(["StartDateTime"]) or find_text(["StartTime", "Start" ])
-    end_text = find_text(["EndDateTime"]) or find_text(["EndTime", "End"])  # not used but sanity
-    res_value = find_text(["Resolution"])  # numeric
-    res_unit = find_text(["Unit"])  # e.g., MIN
+    start_text = found.get("StartDateTime") or found.get("StartTime") or found.get("Start")
+    end_text = found.get("EndDateTime") or found.get("EndTime") or found.get("End")  # not used but sanity
+    res_value = found.get("Resolution")  # numeric
+    res_unit = found.get("Unit")  # e.g., MIN
 
     if not start_text or not res_value or not res_unit:
         # Not an SDAT we understand
         return False
 
     try:
-        start_dt = ensure_datetime_utc(start_text)
+        start_dt = _parse_ts(start_text)
         resolution = int(res_value)
     except Exception:
         return False
@@ -157,34 +235,20 @@ def parse_sdat_file(path: str, meters: AllMeters) -> bool:
         step = timedelta(minutes=resolution)
 
     # Iterate observations; accommodate various nesting
-    observations = []
-    for p in ns_candidates:
-        obs_tag = f"{p}:Observation" if p else "Observation"
-        observations.extend(root.findall(f".//{obs_tag}"))
+    observations = root.findall(".//{*}Observation")
     if not observations:
         return False
 
     series = meters.setdefault(meter_id, OrderedDict())
 
     for obs in observations:
-        # Sequence
-        seq_text = None
-        vol_text = None
-        for p in ns_candidates:
-            seq_el = obs.find(f".//{p}:Sequence") if p else obs.find(".//Sequence")
-            if seq_el is not None and seq_el.text:
-                seq_text = seq_el.text.strip()
-                break
-        for p in ns_candidates:
-            vol_el = obs.find(f".//{p}:Volume") if p else obs.find(".//Volume")
-            if vol_el is not None and vol_el.text:
-                vol_text = vol_el.text.strip()
-                break
+        seq_text = obs.findtext(".//{*}Sequence")
+        vol_text = obs.findtext(".//{*}Volume")
         if not seq_text or not vol_text:
             continue
         try:
-            seq = int(seq_text)
-            vol = float(vol_text.replace(",", "."))
+            seq = int(seq_text.strip())
+            vol = float(vol_text.strip().replace(",", "."))
         except ValueError:
             continue
         ts = start_dt + (seq - 1) * step
@@ -197,117 +261,300 @@ def parse_sdat_file(path: str, meters: AllMeters) -> bool:
 # ESL parsing (absolute values)
 # -----------------------------
 
+def _iter_time_periods(path: str) -> Iterable[etree.Element]:
+    """Stream TimePeriod elements from an ESL file, freeing processed subtrees.
+
+    Uses lxml's tag-filtered iterparse when available; otherwise the stdlib
+    iterparse, which still avoids holding the whole document in memory.
+    """
+    if _HAVE_LXML:
+        for _event, tp in etree.iterparse(path, events=("end",), tag="{*}TimePeriod"):
+            yield tp
+            # Free the processed subtree and any preceding siblings
+            tp.clear()
+            while tp.getprevious() is not None:
+                del tp.getparent()[0]
+    else:
+        for _event, elem in etree.iterparse(path, events=("end",)):
+            if elem.tag.rpartition("}")[2] == "TimePeriod":
+                yield elem
+                elem.clear()
+
+
 def parse_esl_file(path: str, meters: AllMeters) -> bool:
     """Parse an ESL XML and merge absolute meter readings (sum HT+NT) into meters.
 
+    Streams `TimePeriod` elements via tag-filtered iterparse instead of
+    building the full tree; each processed subtree is freed immediately so
+    peak memory stays independent of file size.
+
     Returns True if file looked like ESL and was parsed, else False.
     """
+    found_period = False
     try:
-        tree = ET.parse(path)
-        root = tree.getroot()
-    except ET.ParseError:
+        for tp in _iter_time_periods(path):
+            found_period = True
+            end_attr = tp.get("end") or tp.get("End")
+            if end_attr:
+                # Some exports use 'start' only; skip if no end
+                ts = _parse_ts(end_attr)
+
+                sum_import = 0.0
+                sum_export = 0.0
+                import_present = False
+                export_present = False
+
+                for vr in tp.iterfind(".//{*}ValueRow"):
+                    # One pass over the handful of attributes instead of
+                    # three .get probes (including the value/val fallback)
+                    obis = ""
+                    val_text = ""
+                    for k, v in vr.items():
+                        if k == "obis":
+                            obis = v
+                        elif k == "value":
+                            val_text = v or val_text
+                        elif k == "val" and not val_text:
+                            val_text = v
+                    try:
+                        val = float(val_text.replace(",", "."))
+                    except ValueError:
+                        continue
+
+                    m = _OBIS_RE.search(obis)
+                    if m is None:
+                        continue
+                    if m.group(1).startswith("1"):
+                        sum_import += val
+                        import_present = True
+                    else:
+                        sum_export += val
+                        export_present = True
+
+                if import_present:
+                    series = meters.setdefault(METER_IMPORT_ID, OrderedDict())
+                    add_or_update_messwert(series, ts, value=sum_import)
+                if export_present:
+                    series = meters.setdefault(METER_EXPORT_ID, OrderedDict())
+                    add_or_update_messwert(series, ts, value=sum_export)
+    except _XMLParseError:
         return False
 
-    # Heuristic: must have TimePeriod and ValueRow
-    time_periods = root.findall(".//TimePeriod")
-    if not time_periods:
-        return False
+    return found_period
 
-    for tp in time_periods:
-        end_attr = tp.attrib.get("end") or tp.attrib.get("End")
-        if not end_attr:
-            # Some exports use 'start' only; skip if no end
-            continue
-        ts = ensure_datetime_utc(end_attr)
 
-        sum_import = 0.0
-        sum_export = 0.0
-        import_present = False
-        export_present = False
+# -----------------------------
+# Loading all XML files
+# -----------------------------
+
+# Process-wide caches so warm requests only pay for os.stat calls instead of
+# reparsing every XML file. `_FILE_CACHE` holds per-file parse results keyed by
+# path; `_RESULT_CACHE` holds the merged result per directory set, keyed by the
+# fingerprint (path, mtime_ns, size) of every XML file found.
+FileFingerprint = Tuple[str, int, int]
+# Per-file parse result: plain (ts, value, relative) tuples so partials are
+# picklable and can come back from worker processes. None = field not present.
+PartialSeries = Dict[str, List[Tuple[datetime, Optional[float], Optional[float]]]]
+_FILE_CACHE: Dict[str, Tuple[int, int, PartialSeries]] = {}
+_RESULT_CACHE: Dict[Tuple[str, ...], Tuple[Tuple[FileFingerprint, ...], MeterArrays]] = {}
 
-        for vr in tp.findall(".//ValueRow"):
-            obis = vr.attrib.get("obis", "")
-            status = vr.attrib.get("status", "")
-            val_text = vr.attrib.get("value") or vr.attrib.get("val") or ""
+# Below this many changed files the process-pool overhead outweighs the win
+_PARALLEL_MIN_FILES = 16
+
+
+def _normalize_dirs(data_dirs: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """Normalize the load_all_data directory argument to a tuple of paths."""
+    if data_dirs is None:
+        return (DATA_DIR, EXTRA_SDAT_DIR)
+    if isinstance(data_dirs, (str, os.PathLike)):
+        return (str(data_dirs),)
+    return tuple(str(p) for p in data_dirs)
+
+
+def _iter_xml(dir_path: str) -> Iterable[Tuple[str, os.stat_result]]:
+    """Recursively yield (path, stat) for every XML file under dir_path.
+
+    Uses os.scandir directly: DirEntry.is_dir/.stat reuse the data fetched
+    while reading the directory, so fingerprinting costs no extra stat
+    syscall per file, and non-XML entries are skipped at the dirent level.
+    """
+    try:
+        it = os.scandir(dir_path)
+    except OSError:
+        return
+    with it:
+        for entry in it:
             try:
-                val = float(val_text.replace(",", "."))
-            except ValueError:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _iter_xml(entry.path)
+                elif entry.name.lower().endswith(".xml"):
+                    yield entry.path, entry.stat()
+            except OSError:
                 continue
 
-            if any(suffix in obis for suffix in OBIS_IMPORT):
-                sum_import += val
-                import_present = True
-            elif any(suffix in obis for suffix in OBIS_EXPORT):
-                sum_export += val
-                export_present = True
 
-        if import_present:
-            series = meters.setdefault(METER_IMPORT_ID, OrderedDict())
-            add_or_update_messwert(series, ts, value=sum_import)
-        if export_present:
-            series = meters.setdefault(METER_EXPORT_ID, OrderedDict())
-            add_or_update_messwert(series, ts, value=sum_export)
+def _list_xml_files(candidate_dirs: Iterable[str]) -> List[FileFingerprint]:
+    """Collect (path, mtime_ns, size) for every XML file under the given dirs."""
+    return [
+        (path, st.st_mtime_ns, st.st_size)
+        for dir_path in candidate_dirs
+        for path, st in _iter_xml(dir_path)
+    ]
 
-    return True
 
+def _probe_kind(path: str) -> Optional[str]:
+    """Sniff whether an XML file is ESL or SDAT from its root tag.
 
-# -----------------------------
-# Loading all XML files
-# -----------------------------
+    Reads only the first start event, so dispatching costs one parser setup
+    instead of a full parse of the wrong format. Returns "esl", "sdat" or
+    None for anything unrecognized.
+    """
+    try:
+        for _event, elem in etree.iterparse(path, events=("start",)):
+            local = elem.tag.rpartition("}")[2]
+            if local == "ESLBillingData":
+                return "esl"
+            if local.startswith("ValidatedMeteredData"):
+                return "sdat"
+            return None
+    except _XMLParseError:
+        return None
+    return None
 
-def load_all_data(data_dirs: Optional[Iterable[str]] = None) -> AllMeters:
-    """Load ESL and SDAT XML files from one or more directories recursively.
 
-    Accepts a single path (string) or an iterable of paths. If omitted, scans
-    both the default `data/` and `SDAT-Files/` directories when present.
+def _parse_one(fpath: str) -> PartialSeries:
+    """Parse a single XML file into plain per-meter (ts, value, relative) rows.
+
+    Runs in the parent or in a worker process; the return value is picklable.
     """
     meters: AllMeters = {}
+    # One cheap probe picks the parser; unrecognized files stay empty instead
+    # of being parsed twice (once per format) like before
+    kind = _probe_kind(fpath)
+    if kind == "esl":
+        parse_esl_file(fpath, meters)
+    elif kind == "sdat":
+        parse_sdat_file(fpath, meters)
+    partial: PartialSeries = {}
+    for meter_id, series in meters.items():
+        rows = [
+            (
+                ts,
+                (mw.value if mw.value == mw.value else None),
+                (mw.relative if mw.relative == mw.relative else None),
+            )
+            for ts, mw in series.items()
+        ]
+        # Sort once at parse time (and thus once per cache fill), so merging
+        # cached partials later is a pure k-way merge without re-sorting
+        rows.sort(key=lambda r: r[0])
+        partial[meter_id] = rows
+    return partial
 
-    # Normalize input directories
-    if data_dirs is None:
-        candidate_dirs = [DATA_DIR, EXTRA_SDAT_DIR]
-    elif isinstance(data_dirs, (str, os.PathLike)):
-        candidate_dirs = [str(data_dirs)]
-    else:
-        candidate_dirs = [str(p) for p in data_dirs]
 
-    for dir_path in candidate_dirs:
-        if not os.path.isdir(dir_path):
-            continue
-        # Walk recursively for .xml files
-        for root_dir, _dirs, files in os.walk(dir_path):
-            for fname in files:
-                if not fname.lower().endswith(".xml"):
-                    continue
-                fpath = os.path.join(root_dir, fname)
+def load_all_data(data_dirs: Optional[Iterable[str]] = None) -> MeterArrays:
+    """Load ESL and SDAT XML files from one or more directories recursively.
 
-                # Try ESL first, then SDAT; if neither, skip silently
-                parsed = parse_esl_file(fpath, meters)
-                if not parsed:
-                    parse_sdat_file(fpath, meters)
+    Accepts a single path (string) or an iterable of paths. If omitted, scans
+    both the default `data/` and `SDAT-Files/` directories when present.
+    Returns each meter as a timestamp-sorted `SeriesArrays`.
 
-    # De-duplicate by timestamp: using OrderedDict naturally keeps last write
-    # Sort each meter's series by timestamp to ensure chronological order
-    for meter_id, series in list(meters.items()):
-        ordered = OrderedDict(sorted(series.items(), key=lambda kv: kv[0]))
-        meters[meter_id] = ordered
+    Results are cached process-wide: when no XML file under the given
+    directories changed (same path/mtime/size fingerprint), the previously
+    merged result is returned without reparsing. Otherwise only changed files
+    are reparsed and the partial results merged again.
+    """
+    cache_key = _normalize_dirs(data_dirs)
+    xml_files = _list_xml_files(cache_key)
+    fingerprint = tuple(sorted(xml_files))
+    cached = _RESULT_CACHE.get(cache_key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    # Reparse only files whose (mtime, size) changed; independent file parses
+    # fan out to worker processes when enough of them changed at once
+    to_parse = [
+        (fpath, mtime_ns, size)
+        for fpath, mtime_ns, size in xml_files
+        if (entry := _FILE_CACHE.get(fpath)) is None
+        or entry[0] != mtime_ns
+        or entry[1] != size
+    ]
+    if len(to_parse) >= _PARALLEL_MIN_FILES and (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor() as pool:
+            chunksize = max(1, len(to_parse) // ((os.cpu_count() or 1) * 4))
+            partials = pool.map(_parse_one, [f[0] for f in to_parse], chunksize=chunksize)
+            for (fpath, mtime_ns, size), partial in zip(to_parse, partials):
+                _FILE_CACHE[fpath] = (mtime_ns, size, partial)
+    else:
+        for fpath, mtime_ns, size in to_parse:
+            _FILE_CACHE[fpath] = (mtime_ns, size, _parse_one(fpath))
+
+    # Group the (cached or fresh) sorted partials per meter, in file order so
+    # duplicate timestamps keep their last-write-wins semantics
+    per_meter: Dict[str, List[List[Tuple[datetime, Optional[float], Optional[float]]]]] = {}
+    for fpath, _mtime_ns, _size in xml_files:
+        for meter_id, rows in _FILE_CACHE[fpath][2].items():
+            if rows:
+                per_meter.setdefault(meter_id, []).append(rows)
+
+    # Every partial is already sorted, so a stable k-way merge yields each
+    # meter chronologically without the former O(N log N) re-sort. Duplicate
+    # timestamps arrive adjacent and are folded field-by-field.
+    arrays: MeterArrays = {}
+    for meter_id, row_lists in per_meter.items():
+        timestamps: List[datetime] = []
+        values: List[float] = []
+        relatives: List[float] = []
+        for ts, value, relative in heapq.merge(*row_lists, key=lambda r: r[0]):
+            if timestamps and timestamps[-1] == ts:
+                if value is not None:
+                    values[-1] = value
+                if relative is not None:
+                    relatives[-1] = relative
+            else:
+                timestamps.append(ts)
+                values.append(value if value is not None else float("nan"))
+                relatives.append(relative if relative is not None else float("nan"))
+        arrays[meter_id] = SeriesArrays(
+            timestamps,
+            np.asarray(values, dtype=np.float32),
+            np.asarray(relatives, dtype=np.float32),
+        )
 
-    return meters
+    _RESULT_CACHE[cache_key] = (fingerprint, arrays)
+    return arrays
 
 
-def build_chartjs_payload(meters: AllMeters) -> Dict[str, object]:
+def build_chartjs_payload(meters: MeterArrays) -> Dict[str, object]:
     # Collect unified label set (timestamps) for both meters
     label_set = set()
     for series in meters.values():
-        label_set.update(series.keys())
+        label_set.update(series.timestamps)
     labels = sorted(label_set)
 
     def series_values(meter_id: str) -> List[Optional[float]]:
-        series = meters.get(meter_id, {})
-        return [ (series[ts].value if ts in series else None) for ts in labels ]
+        series = meters.get(meter_id)
+        if series is None:
+            return [None] * len(labels)
+        # Merge-walk: labels and series.timestamps are both sorted
+        out: List[Optional[float]] = []
+        ts_arr = series.timestamps
+        vals = series.values
+        n = len(ts_arr)
+        j = 0
+        for ts in labels:
+            while j < n and ts_arr[j] < ts:
+                j += 1
+            if j < n and ts_arr[j] == ts:
+                out.append(vals[j])
+                j += 1
+            else:
+                out.append(None)
+        return out
 
     payload = {
-        "labels": [dt.astimezone(timezone.utc).isoformat() for dt in labels],
+        "labels": [_iso_utc(dt) for dt in labels],
         "datasets": [
             {
                 "label": "Einspeisung (ID735)",
@@ -334,46 +581,77 @@ def build_chartjs_payload(meters: AllMeters) -> Dict[str, object]:
 # Consumption (ESL diffs)
 # -----------------------------
 
-def build_consumption_payload(meters: AllMeters) -> Dict[str, object]:
+if njit is not None:
+
+    @njit(cache=True)
+    def _sanitized_diffs(vals: np.ndarray) -> np.ndarray:
+        """Successive diffs with negative/non-finite entries replaced by NaN.
+
+        One fused pass over the array instead of the diff/mask/where
+        temporaries of the NumPy version.
+        """
+        out = np.empty(vals.size - 1, vals.dtype)
+        for i in range(1, vals.size):
+            d = vals[i] - vals[i - 1]
+            out[i - 1] = d if (np.isfinite(d) and d >= 0.0) else np.nan
+        return out
+
+else:
+
+    def _sanitized_diffs(vals: np.ndarray) -> np.ndarray:
+        """Successive diffs with negative/non-finite entries replaced by NaN."""
+        d = np.diff(vals)
+        return np.where((d < 0) | ~np.isfinite(d), np.nan, d)
+
+
+def build_consumption_payload(meters: MeterArrays) -> Dict[str, object]:
     """Build a payload with per-period consumption from ESL diffs.
 
     For each meter series, compute successive differences of absolute values.
     Negative or non-finite diffs are treated as missing.
     """
 
-    def series_diffs(series: MeterSeries) -> Dict[datetime, Optional[float]]:
-        timestamps = sorted(series.keys())
-        diffs: Dict[datetime, Optional[float]] = {}
-        for i in range(1, len(timestamps)):
-            t_prev = timestamps[i - 1]
-            t_curr = timestamps[i]
-            v_prev = series[t_prev].value
-            v_curr = series[t_curr].value
-            try:
-                diff = float(v_curr) - float(v_prev)
-            except Exception:
-                diff = float("nan")
-            if not (diff == diff) or diff < 0:  # NaN or negative
-                diffs[t_curr] = None
-            else:
-                diffs[t_curr] = diff
-        return diffs
-
-    import_diffs = series_diffs(meters.get(METER_IMPORT_ID, OrderedDict()))
-    export_diffs = series_diffs(meters.get(METER_EXPORT_ID, OrderedDict()))
-
-    label_set = set(import_diffs.keys()) | set(export_diffs.keys())
-    labels = sorted(label_set)
-
-    def values_for(diffs_map: Dict[datetime, Optional[float]]) -> List[Optional[float]]:
-        return [diffs_map.get(ts) for ts in labels]
+    def series_diffs(series: Optional[SeriesArrays]) -> Tuple[List[datetime], List[Optional[float]]]:
+        if series is None or len(series.timestamps) < 2:
+            return [], []
+        # Stays float32 end to end; scalars pass through to orjson unboxed
+        d = _sanitized_diffs(series.values)
+        return series.timestamps[1:], [None if v != v else v for v in d]
+
+    import_ts, import_diffs = series_diffs(meters.get(METER_IMPORT_ID))
+    export_ts, export_diffs = series_diffs(meters.get(METER_EXPORT_ID))
+
+    # Merge the two sorted timestamp lists into the label axis and resolve
+    # both series in the same lockstep walk — parallel lists, no hashing of
+    # datetime keys at any point
+    labels: List[datetime] = []
+    import_vals: List[Optional[float]] = []
+    export_vals: List[Optional[float]] = []
+    i = j = 0
+    n_imp, n_exp = len(import_ts), len(export_ts)
+    while i < n_imp or j < n_exp:
+        if j >= n_exp or (i < n_imp and import_ts[i] <= export_ts[j]):
+            ts = import_ts[i]
+        else:
+            ts = export_ts[j]
+        labels.append(ts)
+        if i < n_imp and import_ts[i] == ts:
+            import_vals.append(import_diffs[i])
+            i += 1
+        else:
+            import_vals.append(None)
+        if j < n_exp and export_ts[j] == ts:
+            export_vals.append(export_diffs[j])
+            j += 1
+        else:
+            export_vals.append(None)
 
     payload = {
-        "labels": [dt.astimezone(timezone.utc).isoformat() for dt in labels],
+        "labels": [_iso_utc(dt) for dt in labels],
         "datasets": [
             {
                 "label": "Einspeisung (Verbrauch) ID735",
-                "data": values_for(export_diffs),
+                "data": export_vals,
                 "borderColor": "#2ca02c",
                 "backgroundColor": "rgba(44,160,44,0.2)",
                 "tension": 0.2,
@@ -381,7 +659,7 @@ def build_consumption_payload(meters: AllMeters) -> Dict[str, object]:
             },
             {
                 "label": "Bezug (Verbrauch) ID742",
-                "data": values_for(import_diffs),
+                "data": import_vals,
                 "borderColor": "#1f77b4",
                 "backgroundColor": "rgba(31,119,180,0.2)",
                 "tension": 0.2,
@@ -392,64 +670,143 @@ def build_consumption_payload(meters: AllMeters) -> Dict[str, object]:
     return payload
 
 
-def build_json_export_payload(meters: AllMeters) -> Dict[str, List[Dict[str, object]]]:
+def build_json_export_payload(meters: MeterArrays) -> Dict[str, List[Dict[str, object]]]:
     """Build a JSON-serializable payload from the raw meter data."""
     payload: Dict[str, List[Dict[str, object]]] = {}
     for meter_id, series in meters.items():
         payload[meter_id] = [
             {
-                "timestamp": mw.timestamp.isoformat(),
-                "value": mw.value,
-                "relative": mw.relative,
+                "timestamp": _iso_utc(ts),
+                "value": value,
+                "relative": relative,
             }
-            for mw in series.values()
+            for ts, value, relative in zip(series.timestamps, series.values, series.relatives)
         ]
     return payload
 
 
+# Derived artifacts (payload dicts, serialized JSON) per directory set and
+# artifact name, invalidated whenever the load fingerprint changes
+_ARTIFACT_CACHE: Dict[Tuple[Tuple[str, ...], str], Tuple[Tuple[FileFingerprint, ...], object]] = {}
+
+
+def _cached_artifact(data_dirs, name: str, build):
+    """Return a derived artifact, rebuilt only when the source files changed.
+
+    `build` receives the loaded meters; its result is cached against the same
+    file fingerprint that guards the loader, so warm requests skip payload
+    construction and serialization entirely.
+    """
+    meters = load_all_data(data_dirs)
+    cache_key = _normalize_dirs(data_dirs)
+    fingerprint = _RESULT_CACHE[cache_key][0]
+    entry = _ARTIFACT_CACHE.get((cache_key, name))
+    if entry is not None and entry[0] == fingerprint:
+        return entry[1]
+    artifact = build(meters)
+    _ARTIFACT_CACHE[(cache_key, name)] = (fingerprint, artifact)
+    return artifact
+
+
+def _dump_json(payload: object) -> str:
+    """Serialize a payload compactly (sorted keys, trailing newline).
+
+    Uses orjson's native encoder when installed — several times faster on
+    these numeric-heavy payloads — and falls back to stdlib json with the
+    same byte format otherwise. Note orjson emits non-finite floats as
+    null, which unlike the stdlib's bare NaN is actually valid JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            payload,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY,
+        ).decode()
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), default=float) + "\n"
+
+
+def _chart_json() -> str:
+    return _cached_artifact(
+        DATA_DIR, "chart_json", lambda meters: _dump_json(build_chartjs_payload(meters))
+    )
+
+
+def _consumption_payload() -> Dict[str, object]:
+    return _cached_artifact(DATA_DIR, "consumption_payload", build_consumption_payload)
+
+
+def _consumption_json() -> str:
+    return _cached_artifact(
+        DATA_DIR, "consumption_json", lambda _meters: _dump_json(_consumption_payload())
+    )
+
+
+def _export_json() -> str:
+    return _cached_artifact(
+        DATA_DIR, "export_json", lambda meters: _dump_json(build_json_export_payload(meters))
+    )
+
+
+def stream_csv_response(rows: Iterable[Tuple[object, object, object]]) -> Response:
+    """Stream CSV rows as a chunked response instead of one giant string.
+
+    Rows are written through csv.writer into a small buffer that is flushed
+    to the client every ~8 KiB, so peak memory stays O(chunk) and the first
+    bytes go out before the last row is produced.
+    """
+
+    def generate():
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(("timestamp", "import_kwh", "export_kwh"))
+        for row in rows:
+            writer.writerow(row)
+            if buf.tell() > 8192:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue()
+
+    return Response(generate(), mimetype="text/csv")
+
+
 # -----------------------------
 # Flask app
 # -----------------------------
 
 def create_app() -> Flask:
     app = Flask(__name__)
+    # Compact output for anything still serialized by Flask's own provider
+    app.json.compact = True
+    app.json.ensure_ascii = False
 
     @app.route("/")
     def index():
-        meters = load_all_data(DATA_DIR)
-        data_payload = build_chartjs_payload(meters)
-        data_json = json.dumps(data_payload)
-        return render_template("index.html", data_json=data_json)
+        # Markup: the cached JSON goes into the template verbatim, no
+        # re-escaping pass over a potentially large string
+        return render_template("index.html", data_json=Markup(_chart_json()))
 
     # Optional JSON endpoint for debugging
     @app.route("/api/data")
     def api_data():
-        meters = load_all_data(DATA_DIR)
-        return jsonify(build_chartjs_payload(meters))
+        return Response(_chart_json(), mimetype="application/json")
 
     @app.route("/consumption")
     def consumption_page():
-        meters = load_all_data(DATA_DIR)
-        data_payload = build_consumption_payload(meters)
-        data_json = json.dumps(data_payload)
         return render_template(
             "index.html",
-            data_json=data_json,
+            data_json=Markup(_consumption_json()),
             page_title="Verbrauchsdiagramm",
             y_label="Verbrauch (kWh)",
         )
 
     @app.route("/api/consumption")
     def api_consumption():
-        meters = load_all_data(DATA_DIR)
-        return jsonify(build_consumption_payload(meters))
+        return Response(_consumption_json(), mimetype="application/json")
 
     @app.route("/export.json")
     def export_json():
         """Export all loaded meter data as a JSON file."""
-        meters = load_all_data(DATA_DIR)
-        payload = build_json_export_payload(meters)
-        response = jsonify(payload)
+        response = Response(_export_json(), mimetype="application/json")
         response.headers["Content-Disposition"] = "attachment; filename=export.json"
         return response
 
@@ -459,34 +816,44 @@ def create_app() -> Flask:
         # Build rows: timestamp, import_value, export_value
         label_set = set()
         for series in meters.values():
-            label_set.update(series.keys())
+            label_set.update(series.timestamps)
         labels = sorted(label_set)
-        imp = meters.get(METER_IMPORT_ID, {})
-        exp = meters.get(METER_EXPORT_ID, {})
-        lines = ["timestamp,import_kwh,export_kwh"]
-        for ts in labels:
-            iv = imp[ts].value if ts in imp else ""
-            ev = exp[ts].value if ts in exp else ""
-            lines.append(f"{ts.astimezone(timezone.utc).isoformat()},{iv},{ev}")
-        csv_data = "\n".join(lines) + "\n"
-        return Response(csv_data, mimetype="text/csv")
+        imp = meters.get(METER_IMPORT_ID)
+        exp = meters.get(METER_EXPORT_ID)
+        imp_ts = imp.timestamps if imp is not None else []
+        imp_vals = imp.values if imp is not None else []
+        exp_ts = exp.timestamps if exp is not None else []
+        exp_vals = exp.values if exp is not None else []
+        def rows():
+            # Merge-walk both sorted series against the sorted labels
+            i = j = 0
+            for ts in labels:
+                while i < len(imp_ts) and imp_ts[i] < ts:
+                    i += 1
+                while j < len(exp_ts) and exp_ts[j] < ts:
+                    j += 1
+                iv = imp_vals[i] if i < len(imp_ts) and imp_ts[i] == ts else ""
+                ev = exp_vals[j] if j < len(exp_ts) and exp_ts[j] == ts else ""
+                yield (_iso_utc(ts), iv, ev)
+
+        return stream_csv_response(rows())
 
     @app.route("/export_consumption.csv")
     def export_consumption_csv():
-        meters = load_all_data(DATA_DIR)
-        payload = build_consumption_payload(meters)
+        payload = _consumption_payload()
         labels = payload.get("labels", [])
         ds = payload.get("datasets", [])
         # Expect datasets[0] = export, datasets[1] = import as built above
         exp_vals = (ds[0].get("data") if len(ds) > 0 else []) or []
         imp_vals = (ds[1].get("data") if len(ds) > 1 else []) or []
-        lines = ["timestamp,import_kwh,export_kwh"]
-        for i, ts in enumerate(labels):
-            iv = imp_vals[i] if i < len(imp_vals) and imp_vals[i] is not None else ""
-            ev = exp_vals[i] if i < len(exp_vals) and exp_vals[i] is not None else ""
-            lines.append(f"{ts},{iv},{ev}")
-        csv_data = "\n".join(lines) + "\n"
-        return Response(csv_data, mimetype="text/csv")
+
+        def rows():
+            for i, ts in enumerate(labels):
+                iv = imp_vals[i] if i < len(imp_vals) and imp_vals[i] is not None else ""
+                ev = exp_vals[i] if i < len(exp_vals) and exp_vals[i] is not None else ""
+                yield (ts, iv, ev)
+
+        return stream_csv_response(rows())
 
     return app
 